@@ -3,25 +3,131 @@
 # Run with: streamlit run ticketing_app.py
 from __future__ import annotations
 
+import csv
+import itertools
+import json
+import os
+import re
 import sqlite3
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
 from dataclasses import dataclass
-from datetime import datetime
-from typing import List, Optional, Dict, Any
-import pandas as pd
+from typing import List, Optional, Dict, Any, Iterable, Iterator, Tuple
+import pyarrow as pa
 import io
 
 import streamlit as st
 
 DB_FILE = "tickets.db"
+SCHEMA_VERSION = 5  # stored in PRAGMA user_version; bump when _create_schema changes
 STATUSES = ("open", "in_progress", "closed")
 PRIORITIES = ("low", "medium", "high", "urgent")
+# Sort keys stored in tickets.status_ord / priority_ord; must match the CASEs in the sync triggers
+STATUS_ORD = {"open": 0, "in_progress": 1, "closed": 2}
+PRIO_ORD = {"urgent": 0, "high": 1, "medium": 2, "low": 3}
+MIN_SEARCH_LEN = 3
+# Columns shown in the Tickets tab; the rest are fetched per ticket by get_ticket
+LIST_COLUMNS = ("id", "title", "status", "priority", "updated_at")
+
+# Fixed SQL text, so sqlite3's statement cache reuses the compiled statements
+SQL_CREATE_TICKET = """
+    INSERT INTO tickets (
+        title, description, status, priority, requester, assignee, tags, created_at, updated_at,
+        status_ord, priority_ord, title_rev
+    )
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+SQL_GET_TICKET = """
+    SELECT id, title, COALESCE(description, '') AS description, status, priority, requester, assignee, tags, created_at, updated_at
+    FROM tickets WHERE id = ?
+"""
+SQL_ADD_COMMENT = "INSERT INTO comments (ticket_id, author, body, created_at) VALUES (?, ?, ?, ?)"
+SQL_GET_COMMENTS = "SELECT id, author, body, created_at FROM comments WHERE ticket_id = ? ORDER BY id ASC"
+# Ticket plus its comments as a JSON array, in one statement (the inner subquery fixes the comment order)
+SQL_GET_TICKET_BUNDLE = """
+    SELECT t.id, t.title, COALESCE(t.description, '') AS description, t.status, t.priority, t.requester, t.assignee,
+           t.tags, t.created_at, t.updated_at,
+           (SELECT json_group_array(json_object('id', c.id, 'author', c.author, 'body', c.body, 'created_at', c.created_at))
+            FROM (SELECT id, author, body, created_at FROM comments WHERE ticket_id = t.id ORDER BY id) c) AS comments_json
+    FROM tickets t WHERE t.id = ?
+"""
+# Search statements return LIST_COLUMNS, the same rows as the ticket list
+SQL_SEARCH_FTS = """
+    SELECT t.id, t.title, t.status, t.priority, t.updated_at
+    FROM tickets_fts f
+    JOIN tickets t ON t.id = f.rowid
+    WHERE tickets_fts MATCH ?
+    ORDER BY rank
+"""
+SQL_SEARCH_LIKE = """
+    SELECT id, title, status, priority, updated_at
+    FROM tickets
+    WHERE title LIKE ? OR description LIKE ? OR tags LIKE ?
+    ORDER BY updated_at DESC
+"""
+# 'abc%': anchored title prefix, served by idx_tickets_title_nocase
+SQL_SEARCH_TITLE_PREFIX = """
+    SELECT id, title, status, priority, updated_at
+    FROM tickets
+    WHERE title LIKE ?
+    ORDER BY updated_at DESC
+"""
+# '%abc': title suffix as a prefix of the reversed title, served by idx_tickets_title_rev.
+# Rows written or renamed without title_rev (e.g. by the CLI) have it NULL and are checked the slow way.
+SQL_SEARCH_TITLE_SUFFIX = """
+    SELECT id, title, status, priority, updated_at
+    FROM tickets
+    WHERE title_rev LIKE ?
+    UNION
+    SELECT id, title, status, priority, updated_at
+    FROM tickets
+    WHERE title_rev IS NULL AND title LIKE ?
+    ORDER BY updated_at DESC
+"""
+# UNION de-duplicates tickets matched by both halves
+SQL_SEARCH_PREFIX = """
+    SELECT id, title, status, priority, updated_at
+    FROM tickets
+    WHERE title LIKE ?
+    UNION
+    SELECT id, title, status, priority, updated_at
+    FROM tickets
+    WHERE description LIKE ? OR tags LIKE ?
+    ORDER BY updated_at DESC
+"""
+SQL_EXPORT_TICKETS = """
+    SELECT id, title, description, status, priority, requester, assignee, tags, created_at, updated_at
+    FROM tickets ORDER BY id ASC
+"""
+
+
+def _list_tickets_sql(status: bool, priority: bool, assignee: bool) -> str:
+    clauses = [c for c, on in (("status = ?", status), ("priority = ?", priority), ("assignee = ?", assignee)) if on]
+    where_sql = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    return f"""SELECT {', '.join(LIST_COLUMNS)}
+               FROM tickets {where_sql}
+               ORDER BY status_ord, priority_ord, created_at DESC;"""
+
+
+# One statement per combination of set filters, keyed by (status, priority, assignee) presence
+SQL_LIST_TICKETS = {key: _list_tickets_sql(*key) for key in itertools.product((False, True), repeat=3)}
+
+
+# [second, formatted] of the last call; timestamps have second resolution, so reuse within a second
+_ts_cache: List[Any] = [0, ""]
 
 
 def now_iso() -> str:
-    return datetime.utcnow().isoformat(timespec="seconds") + "Z"
+    s = int(time.time())
+    if s != _ts_cache[0]:
+        _ts_cache[0] = s
+        _ts_cache[1] = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(s))
+    return _ts_cache[1]
 
 
-@dataclass
+@dataclass(slots=True)
 class Ticket:
     id: Optional[int]
     title: str
@@ -39,19 +145,83 @@ class TicketingSystem:
     def __init__(self, db_path: str = DB_FILE):
         self.db_path = db_path
         # check_same_thread False to allow Streamlit reruns to reuse connection safely
-        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        # isolation_level=None: no implicit BEGINs, write transactions are opened by _transaction()
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
         self.conn.row_factory = sqlite3.Row
+        # Per-connection settings: WAL lets readers run alongside a writer, NORMAL sync
+        # only fsyncs at checkpoints, and foreign_keys must be enabled on every connection.
+        # The title LIKE searches only use the NOCASE indexes while case_sensitive_like is OFF;
+        # a connection that turns it on falls back to full scans.
+        self.conn.executescript(
+            """
+            PRAGMA journal_mode = WAL;
+            PRAGMA synchronous = NORMAL;
+            PRAGMA temp_store = MEMORY;
+            PRAGMA mmap_size = 268435456;
+            PRAGMA cache_size = -65536;
+            PRAGMA busy_timeout = 5000;
+            PRAGMA foreign_keys = ON;
+            PRAGMA case_sensitive_like = OFF;
+            """
+        )
+        # Bumped by every committed write so cached reads keyed on data_version() go stale
+        self.writes = 0
+        # TICKETS_TRACE_SQL=1 counts list calls per (status, priority, assignee) filter combination
+        self.trace_list = bool(os.environ.get("TICKETS_TRACE_SQL"))
+        self.list_combo_counts: Counter[Tuple[bool, bool, bool]] = Counter()
+        # The connection is shared by every session. Every use of it holds this lock, so reads
+        # never see another session's uncommitted write transaction
+        self._conn_lock = threading.Lock()
         self._init_db()
 
+    @contextmanager
+    def _transaction(self) -> Iterator[None]:
+        # IMMEDIATE takes the write lock up front, so a transaction never has to upgrade
+        # from a read lock (SQLITE_BUSY under WAL when another writer got there first)
+        with self._conn_lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+            self.conn.execute("COMMIT")
+            self.writes += 1
+
+    def _fetchall(self, sql: str, params: Iterable[Any] = ()) -> List[sqlite3.Row]:
+        with self._conn_lock:
+            return self.conn.execute(sql, params).fetchall()
+
+    def _fetchone(self, sql: str, params: Iterable[Any] = ()) -> Optional[sqlite3.Row]:
+        with self._conn_lock:
+            return self.conn.execute(sql, params).fetchone()
+
+    def data_version(self) -> Tuple[int, int]:
+        # Local write counter plus SQLite's counter for commits from other connections (e.g. the CLI)
+        return self.writes, self._fetchone("PRAGMA data_version")[0]
+
     def _init_db(self) -> None:
+        # Run the DDL only when the file's schema is older than this code
+        if self.conn.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+            try:
+                self._create_schema()
+            except Exception:
+                self.conn.rollback()
+                raise
+        self.has_fts = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'tickets_fts'"
+        ).fetchone() is not None
+
+    def _create_schema(self) -> None:
         cur = self.conn.cursor()
+        # executescript commits first; the BEGIN keeps the rest of the DDL in one transaction
         cur.executescript(
             """
-            PRAGMA foreign_keys = ON;
+            BEGIN;
 
             CREATE TABLE IF NOT EXISTS tickets (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
-                title TEXT NOT NULL,
+                title TEXT NOT NULL COLLATE NOCASE,
                 description TEXT,
                 status TEXT NOT NULL DEFAULT 'open' CHECK(status IN ('open','in_progress','closed')),
                 priority TEXT NOT NULL DEFAULT 'medium' CHECK(priority IN ('low','medium','high','urgent')),
@@ -59,7 +229,10 @@ class TicketingSystem:
                 assignee TEXT,
                 tags TEXT,
                 created_at TEXT NOT NULL,
-                updated_at TEXT NOT NULL
+                updated_at TEXT NOT NULL,
+                status_ord INTEGER NOT NULL DEFAULT 0,
+                priority_ord INTEGER NOT NULL DEFAULT 2,
+                title_rev TEXT COLLATE NOCASE
             );
 
             CREATE TABLE IF NOT EXISTS comments (
@@ -74,81 +247,195 @@ class TicketingSystem:
             CREATE INDEX IF NOT EXISTS idx_tickets_status ON tickets(status);
             CREATE INDEX IF NOT EXISTS idx_tickets_priority ON tickets(priority);
             CREATE INDEX IF NOT EXISTS idx_tickets_assignee ON tickets(assignee);
+            CREATE INDEX IF NOT EXISTS idx_tickets_title_nocase ON tickets(title COLLATE NOCASE);
+            """
+        )
+        self._add_sort_columns()
+        self._add_title_rev()
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_tickets_title_rev ON tickets(title_rev COLLATE NOCASE)")
+        # A rename that leaves title_rev alone (e.g. from the CLI) clears it, so suffix search
+        # falls back to the title for that row instead of matching the old title
+        cur.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS tickets_title_rev_au AFTER UPDATE OF title ON tickets
+            WHEN new.title IS NOT old.title AND new.title_rev IS old.title_rev
+            BEGIN
+                UPDATE tickets SET title_rev = NULL WHERE id = new.id;
+            END
             """
         )
+        # Covers list_tickets' columns in its ORDER BY, so no temp B-tree sort is needed
+        cur.execute("DROP INDEX IF EXISTS idx_tickets_sort")
+        cur.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_tickets_list ON tickets(
+                status_ord, priority_ord, created_at DESC, id, title, status, priority, updated_at
+            )
+            """
+        )
+        self._init_fts()
+        cur.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
         self.conn.commit()
 
+    def _add_sort_columns(self) -> None:
+        # Older databases have no sort keys, or have them as VIRTUAL generated columns;
+        # either way they become plain columns, backfilled once
+        hidden = {r["name"]: r["hidden"] for r in self.conn.execute("PRAGMA table_xinfo(tickets)")}
+        if hidden.get("status_ord") == 0 and hidden.get("priority_ord") == 0:
+            self._add_sort_triggers()
+            return
+        self.conn.execute("DROP INDEX IF EXISTS idx_tickets_sort")
+        self.conn.execute("DROP INDEX IF EXISTS idx_tickets_list")
+        for name, default in (("status_ord", 0), ("priority_ord", 2)):
+            if name in hidden:
+                self.conn.execute(f"ALTER TABLE tickets DROP COLUMN {name}")
+            self.conn.execute(f"ALTER TABLE tickets ADD COLUMN {name} INTEGER NOT NULL DEFAULT {default}")
+        self.conn.execute(
+            """
+            UPDATE tickets SET
+                status_ord = CASE status WHEN 'open' THEN 0 WHEN 'in_progress' THEN 1 ELSE 2 END,
+                priority_ord = CASE priority WHEN 'urgent' THEN 0 WHEN 'high' THEN 1 WHEN 'medium' THEN 2 ELSE 3 END
+            """
+        )
+        self._add_sort_triggers()
+
+    def _add_title_rev(self) -> None:
+        # Reversed title for suffix search; older databases get it added and backfilled once
+        if "title_rev" in {r["name"] for r in self.conn.execute("PRAGMA table_xinfo(tickets)")}:
+            return
+        self.conn.execute("ALTER TABLE tickets ADD COLUMN title_rev TEXT COLLATE NOCASE")
+        self.conn.create_function("reverse", 1, lambda s: s[::-1] if s is not None else None, deterministic=True)
+        self.conn.execute("UPDATE tickets SET title_rev = reverse(title)")
+
+    def _add_sort_triggers(self) -> None:
+        # The app writes the sort keys itself; these only fire for writers that don't (e.g. the CLI)
+        for name, event in (
+            ("tickets_ord_ai", "INSERT"),
+            ("tickets_ord_au", "UPDATE OF status, priority, status_ord, priority_ord"),
+        ):
+            self.conn.execute(
+                f"""
+                CREATE TRIGGER IF NOT EXISTS {name} AFTER {event} ON tickets
+                WHEN new.status_ord IS NOT (CASE new.status WHEN 'open' THEN 0 WHEN 'in_progress' THEN 1 ELSE 2 END)
+                  OR new.priority_ord IS NOT (
+                      CASE new.priority WHEN 'urgent' THEN 0 WHEN 'high' THEN 1 WHEN 'medium' THEN 2 ELSE 3 END
+                  )
+                BEGIN
+                    UPDATE tickets SET
+                        status_ord = CASE new.status WHEN 'open' THEN 0 WHEN 'in_progress' THEN 1 ELSE 2 END,
+                        priority_ord = CASE new.priority WHEN 'urgent' THEN 0 WHEN 'high' THEN 1 WHEN 'medium' THEN 2 ELSE 3 END
+                    WHERE id = new.id;
+                END
+                """
+            )
+
+    def _init_fts(self) -> None:
+        # External-content FTS5 index over tickets, kept in sync by triggers
+        exists = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'tickets_fts'"
+        ).fetchone()
+        try:
+            self.conn.execute(
+                """
+                CREATE VIRTUAL TABLE IF NOT EXISTS tickets_fts USING fts5(
+                    title, description, tags,
+                    content='tickets', content_rowid='id', tokenize='unicode61'
+                )
+                """
+            )
+        except sqlite3.OperationalError:
+            # SQLite built without FTS5: search falls back to LIKE
+            return
+        for trigger in (
+            """
+            CREATE TRIGGER IF NOT EXISTS tickets_fts_ai AFTER INSERT ON tickets BEGIN
+                INSERT INTO tickets_fts (rowid, title, description, tags)
+                VALUES (new.id, new.title, new.description, new.tags);
+            END
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS tickets_fts_ad AFTER DELETE ON tickets BEGIN
+                INSERT INTO tickets_fts (tickets_fts, rowid, title, description, tags)
+                VALUES ('delete', old.id, old.title, old.description, old.tags);
+            END
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS tickets_fts_au AFTER UPDATE OF title, description, tags ON tickets BEGIN
+                INSERT INTO tickets_fts (tickets_fts, rowid, title, description, tags)
+                VALUES ('delete', old.id, old.title, old.description, old.tags);
+                INSERT INTO tickets_fts (rowid, title, description, tags)
+                VALUES (new.id, new.title, new.description, new.tags);
+            END
+            """,
+        ):
+            self.conn.execute(trigger)
+        if not exists:
+            # Index tickets created before the FTS table existed
+            self.conn.execute("INSERT INTO tickets_fts (tickets_fts) VALUES ('rebuild')")
+
     # CRUD
     def create_ticket(self, t: Ticket) -> int:
         created = now_iso()
-        cur = self.conn.cursor()
-        cur.execute(
-            """
-            INSERT INTO tickets (title, description, status, priority, requester, assignee, tags, created_at, updated_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (t.title, t.description, t.status, t.priority, t.requester, t.assignee, t.tags, created, created),
-        )
-        self.conn.commit()
-        return cur.lastrowid
+        with self._transaction():
+            return self.conn.execute(
+                SQL_CREATE_TICKET,
+                (
+                    t.title, t.description, t.status, t.priority, t.requester, t.assignee, t.tags, created, created,
+                    STATUS_ORD.get(t.status, 2), PRIO_ORD.get(t.priority, 3), t.title[::-1],
+                ),
+            ).lastrowid
+
+    def bulk_create_tickets(self, tickets: Iterable[Ticket]) -> int:
+        # One prepared INSERT and one transaction (one fsync) for the whole batch
+        created = now_iso()
+        with self._transaction():
+            cur = self.conn.executemany(
+                SQL_CREATE_TICKET,
+                (
+                    (
+                        t.title, t.description, t.status, t.priority, t.requester, t.assignee, t.tags, created, created,
+                        STATUS_ORD.get(t.status, 2), PRIO_ORD.get(t.priority, 3), t.title[::-1],
+                    )
+                    for t in tickets
+                ),
+            )
+        return cur.rowcount
 
     def get_ticket(self, ticket_id: int) -> Optional[Ticket]:
-        cur = self.conn.cursor()
-        cur.execute("SELECT * FROM tickets WHERE id = ?", (ticket_id,))
-        row = cur.fetchone()
+        row = self._fetchone(SQL_GET_TICKET, (ticket_id,))
         if not row:
             return None
-        return Ticket(
-            id=row["id"],
-            title=row["title"],
-            description=row["description"] or "",
-            status=row["status"],
-            priority=row["priority"],
-            requester=row["requester"],
-            assignee=row["assignee"],
-            tags=row["tags"],
-            created_at=row["created_at"],
-            updated_at=row["updated_at"],
-        )
+        # SQL_GET_TICKET selects exactly the Ticket fields, by name
+        return Ticket(**dict(row))
+
+    def get_ticket_bundle(self, ticket_id: int) -> Tuple[Optional[Ticket], List[Dict[str, Any]]]:
+        row = self._fetchone(SQL_GET_TICKET_BUNDLE, (ticket_id,))
+        if not row:
+            return None, []
+        fields = dict(row)
+        comments = json.loads(fields.pop("comments_json") or "[]")
+        return Ticket(**fields), comments
 
     def list_tickets(self, filters: Dict[str, Any] = None) -> List[sqlite3.Row]:
+        # Only LIST_COLUMNS, read straight out of idx_tickets_list
         filters = filters or {}
-        clauses = []
-        params: List[Any] = []
-
-        if filters.get("status"):
-            clauses.append("status = ?")
-            params.append(filters["status"])
-        if filters.get("priority"):
-            clauses.append("priority = ?")
-            params.append(filters["priority"])
-        if filters.get("assignee"):
-            clauses.append("assignee = ?")
-            params.append(filters["assignee"])
-
-        where_sql = f"WHERE {' AND '.join(clauses)}" if clauses else ""
-        sql = f"""SELECT id, title, status, priority, assignee, requester, tags, created_at, updated_at
-                  FROM tickets {where_sql}
-                  ORDER BY
-                    CASE status
-                      WHEN 'open' THEN 0
-                      WHEN 'in_progress' THEN 1
-                      ELSE 2
-                    END,
-                    CASE priority
-                      WHEN 'urgent' THEN 0
-                      WHEN 'high' THEN 1
-                      WHEN 'medium' THEN 2
-                      ELSE 3
-                    END,
-                    created_at DESC;"""
-        cur = self.conn.cursor()
-        cur.execute(sql, params)
-        return cur.fetchall()
+        status, priority, assignee = filters.get("status"), filters.get("priority"), filters.get("assignee")
+        params = [v for v in (status, priority, assignee) if v]
+        key = (bool(status), bool(priority), bool(assignee))
+        if self.trace_list:
+            self.list_combo_counts[key] += 1
+        return self._fetchall(SQL_LIST_TICKETS[key], params)
 
     def update_ticket(self, ticket_id: int, updates: Dict[str, Any]) -> bool:
         if not updates:
             return False
+        updates = dict(updates)
+        if "status" in updates:
+            updates["status_ord"] = STATUS_ORD.get(updates["status"], 2)
+        if "priority" in updates:
+            updates["priority_ord"] = PRIO_ORD.get(updates["priority"], 3)
+        if "title" in updates:
+            updates["title_rev"] = updates["title"][::-1]
         columns = []
         params: List[Any] = []
         for k, v in updates.items():
@@ -158,61 +445,86 @@ class TicketingSystem:
         params.append(now_iso())
         params.append(ticket_id)
         sql = f"UPDATE tickets SET {', '.join(columns)} WHERE id = ?"
-        cur = self.conn.cursor()
-        cur.execute(sql, params)
-        self.conn.commit()
-        return cur.rowcount > 0
+        with self._transaction():
+            return self.conn.execute(sql, params).rowcount > 0
 
     def add_comment(self, ticket_id: int, author: Optional[str], body: str) -> int:
-        cur = self.conn.cursor()
-        cur.execute(
-            "INSERT INTO comments (ticket_id, author, body, created_at) VALUES (?, ?, ?, ?)",
-            (ticket_id, author, body, now_iso()),
-        )
-        self.conn.commit()
-        return cur.lastrowid
+        with self._transaction():
+            return self.conn.execute(SQL_ADD_COMMENT, (ticket_id, author, body, now_iso())).lastrowid
 
     def get_comments(self, ticket_id: int) -> List[sqlite3.Row]:
-        cur = self.conn.cursor()
-        cur.execute(
-            "SELECT id, author, body, created_at FROM comments WHERE ticket_id = ? ORDER BY id ASC",
-            (ticket_id,),
-        )
-        return cur.fetchall()
+        return self._fetchall(SQL_GET_COMMENTS, (ticket_id,))
 
     def search(self, query: str) -> List[sqlite3.Row]:
+        # Explicit patterns: 'abc%' title prefix, '%abc' title suffix, '%abc%' substring anywhere
+        pattern = re.fullmatch(r"(%?)([^%_]+)(%?)", query)
+        if pattern and (pattern[1] or pattern[3]):
+            lead, core, trail = pattern.groups()
+            if not lead:
+                return self._fetchall(SQL_SEARCH_TITLE_PREFIX, (query,))
+            if not trail:
+                return self._fetchall(SQL_SEARCH_TITLE_SUFFIX, (core[::-1] + "%", query))
+            return self._fetchall(SQL_SEARCH_LIKE, (query, query, query))
+        # Prefix-match every word, e.g. "pay log" -> "pay"* "log"*. The tokenizer drops
+        # punctuation ("c++" would become "c"*), so such queries go to the LIKE scan instead.
+        terms = re.findall(r"\w+", query)
+        if self.has_fts and terms and not re.search(r"[^\w\s]", query):
+            match = " ".join(f'"{term}"*' for term in terms)
+            try:
+                return self._fetchall(SQL_SEARCH_FTS, (match,))
+            except sqlite3.OperationalError:
+                pass
+        return self._search_like(query)
+
+    def _search_like(self, query: str) -> List[sqlite3.Row]:
         like = f"%{query}%"
-        cur = self.conn.cursor()
-        cur.execute(
-            """
-            SELECT id, title, status, priority, assignee, requester, tags, created_at, updated_at
-            FROM tickets
-            WHERE title LIKE ? OR description LIKE ? OR tags LIKE ?
-            ORDER BY updated_at DESC
-            """,
-            (like, like, like),
-        )
-        return cur.fetchall()
+        if re.search(r"[_\W]", query):
+            return self._fetchall(SQL_SEARCH_LIKE, (like, like, like))
+        # Single plain word: the title half is an anchored prefix served by idx_tickets_title_nocase
+        return self._fetchall(SQL_SEARCH_PREFIX, (f"{query}%", like, like))
 
     def export_csv_bytes(self) -> bytes:
-        cur = self.conn.cursor()
-        cur.execute("SELECT * FROM tickets ORDER BY id ASC")
-        rows = [dict(r) for r in cur.fetchall()]
-        df = pd.DataFrame(rows)
-        buf = io.StringIO()
-        df.to_csv(buf, index=False)
-        return buf.getvalue().encode("utf-8")
+        # csv.writer encodes straight into one BytesIO: rows are turned into bytes exactly once
+        buf = io.BytesIO()
+        text = io.TextIOWrapper(buf, encoding="utf-8", newline="", write_through=True)
+        writer = csv.writer(text)
+        with self._conn_lock:
+            cur = self.conn.execute(SQL_EXPORT_TICKETS)
+            writer.writerow([d[0] for d in cur.description])
+            writer.writerows(cur)
+        text.detach()
+        return buf.getvalue()
+
+
+# One TicketingSystem (connection + schema check) shared by every session and rerun
+@st.cache_resource
+def get_ticketing_system(db_path: str) -> TicketingSystem:
+    return TicketingSystem(db_path)
+
+
+# Cached reads: reruns with unchanged arguments and data_version() skip SQLite entirely.
+# The leading underscore keeps Streamlit from hashing the TicketingSystem argument.
+# Every write changes the version key, so max_entries bounds what stale versions can pile up.
+@st.cache_data(show_spinner=False, max_entries=32)
+def cached_list_tickets(_ts: TicketingSystem, db_path: str, filters: Tuple[Tuple[str, Any], ...], version: Tuple[int, int]) -> List[tuple]:
+    return [tuple(r) for r in _ts.list_tickets(dict(filters))]
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def cached_search(_ts: TicketingSystem, db_path: str, query: str, version: Tuple[int, int]) -> List[tuple]:
+    return [tuple(r) for r in _ts.search(query)]
+
+
+@st.cache_data(show_spinner=False, max_entries=1)
+def cached_export_csv(_ts: TicketingSystem, db_path: str, version: Tuple[int, int]) -> bytes:
+    return _ts.export_csv_bytes()
 
 
 # ---------------- Streamlit UI ---------------- #
 st.set_page_config(page_title="Ticketing System", layout="wide")
 st.title("🎫 Ticketing System (SQLite + Streamlit)")
 
-# Keep a single TicketingSystem instance across reruns
-if "ts" not in st.session_state:
-    st.session_state.ts = TicketingSystem(DB_FILE)
-
-ts: TicketingSystem = st.session_state.ts
+ts: TicketingSystem = get_ticketing_system(DB_FILE)
 
 # Sidebar: Create ticket + filters + search
 with st.sidebar:
@@ -260,15 +572,33 @@ with tab_list:
         "priority": f_priority or None,
         "assignee": f_assignee.strip() or None,
     }
-    rows = ts.search(q.strip()) if q.strip() else ts.list_tickets(filters)
-    df = pd.DataFrame(rows, columns=["id","title","status","priority","assignee","requester","tags","created_at","updated_at"]) if rows else pd.DataFrame(columns=["id","title","status","priority","assignee","requester","tags","created_at","updated_at"])
+    query = q.strip()
+    if 0 < len(query) < MIN_SEARCH_LEN:
+        st.caption(f"Type at least {MIN_SEARCH_LEN} characters to search.")
+        query = ""
+    version = ts.data_version()
+    key = ("search", query, version) if query else ("list", tuple(filters.items()), version)
+
+    # Same search/filters and no writes since the last rerun: reuse the table as-is
+    if key == st.session_state.get("list_key"):
+        table = st.session_state["list_table"]
+    else:
+        if query:
+            rows = cached_search(ts, ts.db_path, query, version)
+        else:
+            rows = cached_list_tickets(ts, ts.db_path, tuple(filters.items()), version)
+        # Build the Arrow table st.dataframe renders from directly, column by column
+        cols = list(zip(*rows)) if rows else [[]] * len(LIST_COLUMNS)
+        table = pa.table({name: pa.array(col) for name, col in zip(LIST_COLUMNS, cols)})
+        st.session_state["list_key"] = key
+        st.session_state["list_table"] = table
     st.subheader("Tickets")
-    st.dataframe(df, use_container_width=True, hide_index=True)
+    st.dataframe(table, use_container_width=True, hide_index=True)
 
     # Selection helper
-    if not df.empty:
+    if table.num_rows:
         st.divider()
-        sel_id = st.selectbox("Select a ticket to view/edit", options=df["id"].tolist())
+        sel_id = st.selectbox("Select a ticket to view/edit", options=table.column("id").to_pylist())
         st.session_state["selected_ticket_id"] = sel_id
         st.info(f"Selected ticket #{sel_id}. Go to the **View / Edit** tab.")
 
@@ -277,7 +607,7 @@ with tab_detail:
     if not sel_id:
         st.caption("Pick a ticket in the Tickets tab to view it here.")
     else:
-        ticket = ts.get_ticket(int(sel_id))
+        ticket, comments = ts.get_ticket_bundle(int(sel_id))
         if not ticket:
             st.error("Ticket not found.")
         else:
@@ -333,7 +663,6 @@ with tab_detail:
                     st.experimental_rerun()
 
             st.subheader("Comments")
-            comments = ts.get_comments(ticket.id)
             if comments:
                 for c in comments:
                     who = c["author"] or "Anonymous"
@@ -355,7 +684,7 @@ with tab_detail:
 
 with tab_export:
     st.subheader("Export Tickets to CSV")
-    csv_bytes = ts.export_csv_bytes()
+    csv_bytes = cached_export_csv(ts, ts.db_path, ts.data_version())
     st.download_button(
         "Download CSV",
         data=csv_bytes,
@@ -364,4 +693,42 @@ with tab_export:
         help="Exports all tickets from the database."
     )
 
+    st.subheader("Import Tickets from CSV")
+    # Set by a successful import just before its rerun, shown once afterwards
+    if "import_message" in st.session_state:
+        st.success(st.session_state.pop("import_message"))
+    uploaded = st.file_uploader("CSV file", type=["csv"], help="Same columns as the export; id/created_at/updated_at are ignored.")
+    if uploaded is not None and st.button("Import"):
+        try:
+            reader = csv.DictReader(io.StringIO(uploaded.getvalue().decode("utf-8-sig")))
+            imported = (
+                Ticket(
+                    id=None,
+                    title=(r.get("title") or "").strip(),
+                    description=(r.get("description") or "").strip(),
+                    status=r.get("status") or "open",
+                    priority=r.get("priority") or "medium",
+                    requester=r.get("requester") or None,
+                    assignee=r.get("assignee") or None,
+                    tags=r.get("tags") or None,
+                )
+                for r in reader
+            )
+            count = ts.bulk_create_tickets(t for t in imported if t.title)
+        except (sqlite3.IntegrityError, csv.Error, UnicodeDecodeError) as e:
+            st.error(f"Import failed, no tickets were added: {e}")
+        else:
+            if count <= 0:
+                st.error("No tickets found to import; the CSV needs a `title` column with non-empty values.")
+            else:
+                st.session_state["import_message"] = f"Imported {count} tickets."
+                st.experimental_rerun()
+
+    if ts.list_combo_counts:
+        with st.expander("List filter combinations (TICKETS_TRACE_SQL)"):
+            st.table([
+                {"count": n, "status": s, "priority": p, "assignee": a}
+                for (s, p, a), n in ts.list_combo_counts.most_common()
+            ])
+
     st.markdown("Tip: You can keep using the same `tickets.db` file across the CLI and Streamlit apps.")